@@ -1,11 +1,11 @@
 from pathlib import Path
-import pandas as pd
 
 from src.io import load_data
 from src.preprocess import prep_sessions, prep_wellness, validate_ranges
 from src.features import compute_rolling_load, compute_readiness_score, merge_daily, add_simple_flags
+from src.powerbi_export import widen_float32
 from src.reporting import (
-    export_player_snapshot,
+    export_player_snapshots,
     export_team_daily_report,
     export_powerbi_tables,
 )
@@ -29,11 +29,10 @@ def main():
     # Merge + flags
     daily = merge_daily(players, sessions_feat, wellness_feat)
     daily = add_simple_flags(daily, load_col="internal_load_7d", readiness_col="readiness_score")
-    daily["date"] = pd.to_datetime(daily["date"])
 
     # Snapshot date
     snapshot_date = daily["date"].max()
-    d0 = daily[daily["date"] == snapshot_date].copy()
+    d0 = widen_float32(daily[daily["date"] == snapshot_date])
 
     out_dir = PROJECT_ROOT / "outputs"
 
@@ -91,14 +90,14 @@ def main():
     if low_ready_pid != high_load_pid:
         pids.append(low_ready_pid)
 
-    for pid in pids:
-        png_path, txt_path = export_player_snapshot(
-            daily,
-            player_id=pid,
-            out_dir=out_dir,
-            snapshot_date=snapshot_date,
-            lookback_days=28,
-        )
+    snapshots = export_player_snapshots(
+        daily,
+        player_ids=pids,
+        out_dir=out_dir,
+        snapshot_date=snapshot_date,
+        lookback_days=28,
+    )
+    for png_path, txt_path in snapshots:
         print("\nWrote player snapshot:")
         print(png_path)
         print(txt_path)
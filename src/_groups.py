@@ -0,0 +1,79 @@
+"""
+Group-boundary helpers for frames sorted by player.
+
+Feature and preprocessing steps work on data sorted by (player_id, date), so
+each player's rows form one contiguous block. These helpers locate the blocks
+with a single neighbour comparison instead of going through a pandas groupby.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def key_codes(keys: pd.Series, sort: bool = False) -> np.ndarray:
+    """
+    Integer codes for a key column (categorical codes when available), -1 for missing.
+    With sort=True codes follow the sort order of the keys (categorical codes always do).
+    """
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        return keys.cat.codes.to_numpy()
+    return pd.factorize(keys, sort=sort)[0]
+
+
+def sort_by_player_date(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return df sorted by (player_id, date) with a fresh RangeIndex.
+
+    Input that is already in order (the normal case after preprocessing) is
+    detected with one linear check and returned as a shallow copy instead of
+    being re-sorted. Either way the caller may add columns without touching df.
+    """
+    # Integer codes in key order: cheap to compare, and safe with missing ids
+    k = key_codes(df["player_id"], sort=True)
+    d = df["date"].to_numpy()
+    # Missing ids (code -1) are left to sort_values, which places them last
+    in_order = bool(np.all((k[1:] > k[:-1]) | ((k[1:] == k[:-1]) & (d[1:] >= d[:-1])))) and not (k < 0).any()
+
+    if not in_order:
+        return df.sort_values(["player_id", "date"]).reset_index(drop=True)
+    out = df.copy(deep=False)
+    out.index = pd.RangeIndex(len(out))
+    return out
+
+
+def group_starts(keys: np.ndarray) -> np.ndarray:
+    """
+    Boolean mask that is True on the first row of each contiguous block of key
+    codes. A row without a key (negative code) is a block of its own, so nothing
+    is carried into or out of it.
+    """
+    keys = np.asarray(keys)
+    starts = np.empty(len(keys), dtype=bool)
+    starts[:1] = True
+    starts[1:] = keys[1:] != keys[:-1]
+    starts |= keys < 0
+    return starts
+
+
+def group_start_index(keys: np.ndarray) -> np.ndarray:
+    """For each row, the position of the first row of its block."""
+    starts = group_starts(keys)
+    pos = np.where(starts, np.arange(len(starts)), 0)
+    return np.maximum.accumulate(pos) if len(pos) else pos
+
+
+def fill_positions(keys: np.ndarray, valid: np.ndarray, backward: bool = False) -> np.ndarray:
+    """
+    Row positions to take values from when forward-filling (or back-filling)
+    missing values within contiguous key blocks.
+
+    A missing value with no valid neighbour earlier (later) in its block keeps
+    its own position, so it stays missing.
+    """
+    if backward:
+        n = len(valid)
+        return n - 1 - fill_positions(keys[::-1], valid[::-1])[::-1]
+    pos = np.where(valid | group_starts(keys), np.arange(len(valid)), 0)
+    return np.maximum.accumulate(pos) if len(pos) else pos
@@ -9,6 +9,41 @@ from typing import Iterable, Sequence, Tuple
 import numpy as np
 import pandas as pd
 
+from ._groups import group_start_index, group_starts, key_codes, sort_by_player_date
+
+
+def _rolling_sums(
+    keys: np.ndarray,
+    vals: np.ndarray,
+    windows: Sequence[int],
+    min_periods: int,
+) -> np.ndarray:
+    """
+    Trailing row-window sums within contiguous key blocks, one column per window.
+
+    Uses a single prefix sum over the values (NaN counted as missing, as in
+    pandas rolling) and takes differences clipped to the start of each block.
+    All windows are evaluated together against the shared prefix sums, giving
+    an (N, len(windows)) float32 array (accumulation is done in float64).
+    Rows without a key (code -1) belong to no block and come back missing, as
+    with a pandas groupby.
+    """
+    n = len(vals)
+    start = group_start_index(keys)
+    valid = ~np.isnan(vals)
+
+    csum = np.zeros(n + 1)
+    np.cumsum(np.where(valid, vals, 0.0), out=csum[1:])
+    ccount = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(valid, out=ccount[1:])
+
+    hi = np.arange(1, n + 1)[:, None]
+    lo = np.maximum(hi - np.asarray(windows, dtype=np.int64)[None, :], start[:, None])
+    total = csum[hi] - csum[lo]
+    count = ccount[hi] - ccount[lo]
+    ok = (count >= min_periods) & (np.asarray(keys) >= 0)[:, None]
+    return np.where(ok, total, np.nan).astype(np.float32)
+
 
 def compute_rolling_load(
     sessions: pd.DataFrame,
@@ -22,17 +57,50 @@ def compute_rolling_load(
     Produces columns like:
       internal_load_7d, internal_load_28d
     """
-    out = sessions.copy()
-    out = out.sort_values(["player_id", "date"]).reset_index(drop=True)
-
+    # Same argument checks (and messages) as pandas rolling
+    if not pd.api.types.is_integer(min_periods) or min_periods < 0:
+        raise ValueError("min_periods must be >= 0")
     for w in windows:
-        colname = f"{load_col}_{w}d"
-        out[colname] = (
-            out.groupby("player_id")[load_col]
-            .rolling(window=w, min_periods=min_periods)
-            .sum()
-            .reset_index(level=0, drop=True)
-        )
+        if not pd.api.types.is_integer(w) or w < 0:
+            raise ValueError("window must be an integer 0 or greater")
+        if min_periods > w:
+            raise ValueError(f"min_periods {min_periods} must be <= window {w}")
+
+    out = sort_by_player_date(sessions)
+
+    sums = _rolling_sums(
+        key_codes(out["player_id"]),
+        out[load_col].to_numpy(dtype=float),
+        windows,
+        min_periods,
+    )
+    for j, w in enumerate(windows):
+        out[f"{load_col}_{w}d"] = sums[:, j]
+    return out
+
+
+def _zscore_by_group(codes: np.ndarray, vals: np.ndarray) -> np.ndarray:
+    """
+    Population z-score of vals within each group code, ignoring missing values.
+
+    Groups with zero or undefined spread score 0 (missing values stay missing).
+    Statistics are accumulated in float64; the result is float32.
+    """
+    k = int(codes.max()) + 1 if len(codes) else 0
+    # Rows without a key (code -1) go to a spare bin and come back as missing
+    codes = np.where(codes < 0, k, codes)
+    valid = ~np.isnan(vals)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        n = np.bincount(codes, weights=valid, minlength=k + 1)
+        mu = np.bincount(codes, weights=np.where(valid, vals, 0.0), minlength=k + 1) / n
+        dev = vals - mu[codes]
+        sd = np.sqrt(np.bincount(codes, weights=np.where(valid, dev * dev, 0.0), minlength=k + 1) / n)
+        z = dev / sd[codes]
+
+    flat = (sd == 0) | np.isnan(sd)
+    out = np.where(flat[codes], vals * 0.0, z).astype(np.float32)
+    out[codes == k] = np.nan
     return out
 
 
@@ -51,28 +119,21 @@ def compute_readiness_score(
       readiness_score is z-scored within each player so "low readiness" is comparable
       across players with different baselines.
     """
-    out = wellness.copy()
+    # Shallow copy: new columns are added to out only, input columns are not modified
+    out = wellness.copy(deep=False)
 
     if method != "simple":
         raise ValueError("Only method='simple' is implemented in the starter version.")
 
-    out["readiness_raw"] = (
-        out["sleep_quality"].astype(float)
-        + out["mood"].astype(float)
-        - out["soreness"].astype(float)
-        - out["fatigue"].astype(float)
-        - out["stress"].astype(float)
-    )
+    # One float block and a single matrix-vector product instead of chained casts
+    parts = out[["sleep_quality", "mood", "soreness", "fatigue", "stress"]].to_numpy(dtype=np.float32, na_value=np.nan)
+    out["readiness_raw"] = parts @ np.array([1, 1, -1, -1, -1], dtype=np.float32)
 
     if standardize_within_player:
-        def zscore(s: pd.Series) -> pd.Series:
-            mu = s.mean()
-            sd = s.std(ddof=0)
-            if sd == 0 or np.isnan(sd):
-                return s * 0.0
-            return (s - mu) / sd
-
-        out["readiness_score"] = out.groupby("player_id")["readiness_raw"].transform(zscore)
+        out["readiness_score"] = _zscore_by_group(
+            key_codes(out["player_id"]),
+            out["readiness_raw"].to_numpy(dtype=float),
+        )
     else:
         out["readiness_score"] = out["readiness_raw"]
 
@@ -83,28 +144,51 @@ def merge_daily(
     players: pd.DataFrame,
     sessions: pd.DataFrame,
     wellness: pd.DataFrame,
+    wellness_tolerance_days: int = 0,
 ) -> pd.DataFrame:
     """
     Merge players + sessions + wellness to a daily table with one row per player-date.
 
     Assumes sessions and wellness already have datetime 'date' column.
+
+    wellness_tolerance_days=0 joins wellness on the exact date (one-to-one, validated).
+    With a positive value, each session takes the same player's nearest wellness entry
+    within that many days (e.g. 1 for questionnaires filed the night before); an
+    entry may then be shared by neighbouring session days.
     """
     # Keep key identity columns
-    p = players[["player_id", "player_name", "position", "status"]].copy()
+    p = players[["player_id", "player_name", "position", "status"]]
 
     # Merge sessions & wellness on player/date
-    daily = pd.merge(
-        sessions,
-        wellness,
-        on=["player_id", "date"],
-        how="left",
-        validate="one_to_one",
-        suffixes=("", "_well")
-    )
+    if wellness_tolerance_days > 0:
+        # merge_asof walks both sides in date order, matching within each player
+        daily = pd.merge_asof(
+            sessions.sort_values("date", kind="stable"),
+            wellness.sort_values("date", kind="stable"),
+            on="date",
+            by="player_id",
+            direction="nearest",
+            tolerance=pd.Timedelta(days=wellness_tolerance_days),
+            suffixes=("", "_well"),
+        )
+    else:
+        daily = pd.merge(
+            sessions,
+            wellness,
+            on=["player_id", "date"],
+            how="left",
+            validate="one_to_one",
+            suffixes=("", "_well")
+        )
 
-    # Add player info
-    daily = pd.merge(daily, p, on="player_id", how="left", validate="many_to_one")
-    daily = daily.sort_values(["player_id", "date"]).reset_index(drop=True)
+    # Add player info: players has one row per id, so look up each row's position
+    # in players once and gather the identity columns (missing ids give NaN)
+    if not p["player_id"].is_unique:
+        raise pd.errors.MergeError("players.player_id must be unique to attach player info.")
+    idx = pd.Index(p["player_id"]).get_indexer(daily["player_id"])
+    for c in ["player_name", "position", "status"]:
+        daily[c] = p[c].array.take(idx, allow_fill=True)
+    daily = sort_by_player_date(daily)
     return daily
 
 
@@ -120,10 +204,16 @@ def add_simple_flags(
     - load_spike: day-to-day % change in rolling load exceeds threshold
     - low_readiness: readiness z-score below threshold (default -1 SD)
     """
-    out = daily.copy().sort_values(["player_id", "date"]).reset_index(drop=True)
-
-    # Percent change in rolling load within player
-    out["load_pct_change"] = out.groupby("player_id")[load_col].pct_change()
+    out = sort_by_player_date(daily)
+
+    # Percent change in rolling load within player (no change on a player's first row)
+    x = out[load_col].to_numpy(dtype=float)
+    prev = np.empty_like(x)
+    prev[:1] = np.nan
+    prev[1:] = x[:-1]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = x / prev - 1.0
+    out["load_pct_change"] = np.where(group_starts(key_codes(out["player_id"])), np.nan, pct).astype(np.float32)
     out["flag_load_spike"] = out["load_pct_change"] > load_spike_pct
 
     # Low readiness threshold
@@ -11,7 +11,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, Tuple
+from typing import Dict, Iterable, Optional, Tuple
 
 import pandas as pd
 
@@ -26,16 +26,49 @@ REQUIRED_WELLNESS_COLS = [
     "soreness", "fatigue", "stress", "mood"
 ]
 
+# Declared column types per file. Declared columns skip pandas type inference;
+# "datetime" columns are parsed as dates on read. Count-style columns that may
+# legitimately be integers are left to inference so they stay integer when complete.
+PLAYERS_SCHEMA: Dict[str, str] = {
+    "player_id": "str", "player_name": "str", "position": "str", "status": "str",
+}
+SESSIONS_SCHEMA: Dict[str, str] = {
+    "date": "datetime", "player_id": "str", "session_type": "str",
+    "minutes": "float64", "sRPE": "float64", "external_load": "float64", "avg_hr": "float64",
+}
+WELLNESS_SCHEMA: Dict[str, str] = {
+    "date": "datetime", "player_id": "str", "sleep_hours": "float64", "sleep_quality": "float64",
+}
+
 
 class SchemaError(ValueError):
     """Raised when an input DataFrame does not meet minimum schema requirements."""
 
 
-def load_csv(path: Path) -> pd.DataFrame:
-    """Load a CSV with no implicit parsing beyond pandas defaults."""
+def load_csv(path: Path, schema: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Load a CSV, parsing any columns named in schema straight to their declared type.
+
+    Columns not in schema (or schema=None) use pandas defaults. If a numeric column
+    holds a stray value (e.g. "DNP"), the numeric declarations are dropped and those
+    columns are read with pandas defaults, so prep_* can coerce the value to NaN as
+    before.
+    """
     if not path.exists():
         raise FileNotFoundError(f"Missing file: {path}")
-    return pd.read_csv(path)
+    if not schema:
+        return pd.read_csv(path)
+
+    header = pd.read_csv(path, nrows=0).columns
+    present = {c: t for c, t in schema.items() if c in header}
+    parse_dates = [c for c, t in present.items() if t == "datetime"]
+    dtype = {c: t for c, t in present.items() if t != "datetime"}
+    try:
+        return pd.read_csv(path, dtype=dtype, parse_dates=parse_dates)
+    except ValueError:
+        # Only numeric declarations can fail; keep the str ones and re-read untyped
+        text = {c: t for c, t in dtype.items() if t == "str"}
+        return pd.read_csv(path, dtype=text, parse_dates=parse_dates)
 
 
 def validate_schema(df: pd.DataFrame, required_cols: Iterable[str], df_name: str) -> None:
@@ -49,18 +82,27 @@ def load_data(project_root: Path) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFr
     """
     Load players, sessions, and wellness data from the project's data/ directory.
 
+    player_id is returned as a categorical shared by all three tables.
+
     Expected paths:
       data/players.csv
       data/sessions.csv
       data/wellness.csv
     """
     data_dir = project_root / "data"
-    players = load_csv(data_dir / "players.csv")
-    sessions = load_csv(data_dir / "sessions.csv")
-    wellness = load_csv(data_dir / "wellness.csv")
+    players = load_csv(data_dir / "players.csv", PLAYERS_SCHEMA)
+    sessions = load_csv(data_dir / "sessions.csv", SESSIONS_SCHEMA)
+    wellness = load_csv(data_dir / "wellness.csv", WELLNESS_SCHEMA)
 
     validate_schema(players, REQUIRED_PLAYERS_COLS, "players")
     validate_schema(sessions, REQUIRED_SESSIONS_COLS, "sessions")
     validate_schema(wellness, REQUIRED_WELLNESS_COLS, "wellness")
 
+    # One shared categorical dtype for player_id so sorts, groupings and merges
+    # compare small integer codes instead of strings.
+    ids = pd.concat([players["player_id"], sessions["player_id"], wellness["player_id"]])
+    player_dtype = pd.CategoricalDtype(sorted(ids.dropna().unique()))
+    for df in (players, sessions, wellness):
+        df["player_id"] = df["player_id"].astype(player_dtype)
+
     return players, sessions, wellness
@@ -1,24 +1,122 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
 import pandas as pd
 
+# Fixed English labels (strftime's %b / %a depend on the process locale)
+MONTH_ABBR = np.array(["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"])
+DAY_ABBR = np.array(["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"])
+
 
 def ensure_dir(p: Path) -> None:
     p.mkdir(parents=True, exist_ok=True)
 
 
+def ensure_datetime(s: pd.Series) -> pd.Series:
+    """Return s as datetime64, parsing only when it is not already datetime."""
+    if pd.api.types.is_datetime64_any_dtype(s):
+        return s
+    return pd.to_datetime(s)
+
+
+def ensure_bool_flags(df: pd.DataFrame, cols) -> None:
+    """
+    Make the flag columns cols of df plain bool in place, with missing as False.
+    Columns that are already bool (the pipeline's output) are left untouched.
+    """
+    for c in cols:
+        s = df[c]
+        if s.dtype == bool:
+            continue
+        if isinstance(s.dtype, pd.BooleanDtype):
+            df[c] = s.to_numpy(dtype=bool, na_value=False)
+        else:
+            # Column's own dtype (e.g. float 1.0/0.0/NaN) rather than boxing to object
+            df[c] = np.where(s.isna().to_numpy(), False, s.to_numpy()).astype(bool)
+
+
+def widen_float32(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return df with float32 columns as float64 holding each value's shortest float32
+    round-trip decimal (499.59 rather than 499.5899963), so text output shows the
+    digits float32 actually holds. Other columns are not copied.
+    """
+    cols = [c for c in df.columns if df[c].dtype == np.float32]
+    if not cols:
+        return df
+    out = df.copy(deep=False)
+    for c in cols:
+        # str() of a float32 is its shortest round-trip repr (missing stays missing)
+        out[c] = out[c].astype(str).astype(np.float64)
+    return out
+
+
+def write_table(
+    df: pd.DataFrame,
+    path: Path,
+    file_format: str = "csv",
+    partition_cols: Optional[List[str]] = None,
+) -> Path:
+    """
+    Write df to path, using the file extension for file_format.
+
+    CSV writes float32 columns at their float32 precision (see widen_float32);
+    Parquet keeps them float32. file_format='parquet' needs pyarrow installed.
+    With partition_cols (Parquet only) path becomes a hive-partitioned dataset
+    directory (e.g. year=2026/month=1/...), replacing any partitions written by a
+    previous run. Returns the written path.
+    """
+    if partition_cols and file_format != "parquet":
+        raise ValueError("partition_cols requires file_format='parquet'")
+
+    if file_format == "csv":
+        path = path.with_suffix(".csv")
+        widen_float32(df).to_csv(path, index=False)
+    elif file_format == "parquet" and partition_cols:
+        df.to_parquet(
+            path,
+            index=False,
+            compression="zstd",
+            partition_cols=partition_cols,
+            existing_data_behavior="delete_matching",
+        )
+    elif file_format == "parquet":
+        path = path.with_suffix(".parquet")
+        df.to_parquet(path, index=False, compression="zstd")
+    else:
+        raise ValueError("file_format must be one of: 'csv', 'parquet'")
+    return path
+
+
+def make_date_key(dates: pd.Series) -> np.ndarray:
+    """Integer YYYYMMDD key for each date (Power BI relationship key), as int32."""
+    key = dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day
+    return key.to_numpy(dtype=np.int32)
+
+
 def make_calendar_dim(dates: pd.Series) -> pd.DataFrame:
-    d = pd.to_datetime(pd.Series(dates).dropna().unique())
-    cal = pd.DataFrame({"date": pd.to_datetime(sorted(d))})
-    cal["date_key"] = cal["date"].dt.strftime("%Y%m%d").astype(int)
-    cal["year"] = cal["date"].dt.year
-    cal["month"] = cal["date"].dt.month
-    cal["month_name"] = cal["date"].dt.strftime("%b")
+    """
+    Create a calendar dimension table for PowerBI relationships.
+    dates may be a Series, DatetimeIndex or array; it is parsed only if not already datetime.
+    """
+    d = pd.DatetimeIndex(ensure_datetime(pd.Series(dates)).dropna().unique()).sort_values()
+    cal = pd.DataFrame({"date": d})
+    year = cal["date"].dt.year.to_numpy()
+    month = cal["date"].dt.month.to_numpy()
+    day = cal["date"].dt.day.to_numpy()
+    weekday = cal["date"].dt.weekday.to_numpy()
+
+    cal["date_key"] = (year * 10000 + month * 100 + day).astype(np.int32)
+    cal["year"] = year
+    cal["month"] = month
+    cal["month_name"] = MONTH_ABBR[month - 1]
     cal["week"] = cal["date"].dt.isocalendar().week.astype(int)
-    cal["day"] = cal["date"].dt.day
-    cal["day_name"] = cal["date"].dt.strftime("%a")
-    cal["is_weekend"] = (cal["date"].dt.weekday >= 5)
+    cal["day"] = day
+    cal["day_name"] = DAY_ABBR[weekday]
+    cal["is_weekend"] = weekday >= 5
     return cal
 
 
@@ -29,9 +127,9 @@ def make_players_dim(players: pd.DataFrame) -> pd.DataFrame:
 
 
 def make_fact_daily(daily: pd.DataFrame) -> pd.DataFrame:
-    df = daily.copy()
-    df["date"] = pd.to_datetime(df["date"])
-    df["date_key"] = df["date"].dt.strftime("%Y%m%d").astype(int)
+    df = daily.copy(deep=False)
+    df["date"] = ensure_datetime(df["date"])
+    df["date_key"] = make_date_key(df["date"])
     df["player_id"] = df["player_id"].astype(str)
 
     keep = [
@@ -47,32 +145,45 @@ def make_fact_daily(daily: pd.DataFrame) -> pd.DataFrame:
     df = df[keep].sort_values(["player_id", "date"]).reset_index(drop=True)
 
     # Ensure flags are booleans
-    for c in ["flag_load_spike", "flag_low_readiness"]:
-        if c in df.columns:
-            df[c] = df[c].fillna(False).astype(bool)
+    flag_cols = [c for c in ("flag_load_spike", "flag_low_readiness") if c in df.columns]
+    ensure_bool_flags(df, flag_cols)
 
     return df
 
 
-def export_powerbi(players: pd.DataFrame, daily: pd.DataFrame, out_dir: Path) -> dict:
+def export_powerbi(
+    players: pd.DataFrame,
+    daily: pd.DataFrame,
+    out_dir: Path,
+    file_format: str = "csv",
+    partition_fact: bool = False,
+) -> dict:
     """
-    Writes CSVs:
+    Writes tables (CSV by default, or Parquet with file_format='parquet'):
       out_dir/dim_players.csv
       out_dir/dim_calendar.csv
       out_dir/fact_daily.csv
+
+    partition_fact=True (Parquet only) writes fact_daily as a dataset directory
+    partitioned by year/month, which Power BI incremental refresh can load per period.
     """
+    if partition_fact and file_format != "parquet":
+        raise ValueError("partition_fact requires file_format='parquet'")
     ensure_dir(out_dir)
 
     dim_players = make_players_dim(players)
     dim_calendar = make_calendar_dim(daily["date"])
     fact_daily = make_fact_daily(daily)
 
-    p_players = out_dir / "dim_players.csv"
-    p_calendar = out_dir / "dim_calendar.csv"
-    p_fact = out_dir / "fact_daily.csv"
-
-    dim_players.to_csv(p_players, index=False)
-    dim_calendar.to_csv(p_calendar, index=False)
-    fact_daily.to_csv(p_fact, index=False)
+    p_players = write_table(dim_players, out_dir / "dim_players", file_format)
+    p_calendar = write_table(dim_calendar, out_dir / "dim_calendar", file_format)
+    if partition_fact:
+        # Partition keys straight from the integer date_key (YYYYMMDD). Their dtype
+        # is not kept: hive partition values live only in the directory names.
+        fact_daily["year"] = fact_daily["date_key"] // 10000
+        fact_daily["month"] = fact_daily["date_key"] // 100 % 100
+        p_fact = write_table(fact_daily, out_dir / "fact_daily", file_format, partition_cols=["year", "month"])
+    else:
+        p_fact = write_table(fact_daily, out_dir / "fact_daily", file_format)
 
     return {"dim_players": p_players, "dim_calendar": p_calendar, "fact_daily": p_fact}
\ No newline at end of file
@@ -13,6 +13,8 @@ from typing import Tuple
 import numpy as np
 import pandas as pd
 
+from ._groups import fill_positions, key_codes, sort_by_player_date
+
 
 class RangeError(ValueError):
     """Raised when values fall outside expected ranges."""
@@ -20,40 +22,57 @@ class RangeError(ValueError):
 
 def _to_datetime(df: pd.DataFrame, col: str = "date") -> pd.DataFrame:
     out = df.copy()
-    out[col] = pd.to_datetime(out[col], errors="coerce")
+    # Columns already parsed on read (see io.load_csv) only need the NaT check
+    if not pd.api.types.is_datetime64_any_dtype(out[col]):
+        out[col] = pd.to_datetime(out[col], errors="coerce")
     if out[col].isna().any():
         bad = out.loc[out[col].isna()]
         raise ValueError(f"Failed to parse some dates in column '{col}'. Example rows:\n{bad.head(5)}")
     return out
 
 
+# (column, low, high, message); missing values are allowed everywhere
+SESSIONS_RANGES = [
+    ("minutes", 0, np.inf, "sessions.minutes contains negative values."),
+    ("sRPE", 0, 10, "sessions.sRPE should be in [0, 10]."),
+    ("external_load", 0, np.inf, "sessions.external_load contains negative values."),
+    ("total_accels", 0, np.inf, "sessions.total_accels contains negative values."),
+    ("jump_count", 0, np.inf, "sessions.jump_count contains negative values."),
+]
+WELLNESS_RANGES = [
+    ("sleep_quality", 1, 5, "wellness.sleep_quality should be in [1, 5]."),
+    ("soreness", 1, 10, "wellness.soreness should be in [1, 10]."),
+    ("fatigue", 1, 10, "wellness.fatigue should be in [1, 10]."),
+    ("stress", 1, 10, "wellness.stress should be in [1, 10]."),
+    ("mood", 1, 10, "wellness.mood should be in [1, 10]."),
+    ("sleep_hours", 0, 24, "wellness.sleep_hours should be in [0, 24]."),
+]
+
+
+def _to_compact_numeric(s: pd.Series) -> pd.Series:
+    """Coerce to numeric; float columns are stored as float32 (ample for monitoring data)."""
+    out = pd.to_numeric(s, errors="coerce")
+    return out.astype(np.float32) if out.dtype.kind == "f" else out
+
+
+def _check_ranges(df: pd.DataFrame, ranges) -> None:
+    """Check each range column's extremes in its own dtype; raise on the first bad column."""
+    if not len(df):
+        return
+    for col, lo, hi, message in ranges:
+        s = df[col]
+        native = isinstance(s.dtype, np.dtype) and s.dtype.kind in "biuf"
+        vals = s.to_numpy() if native else s.to_numpy(dtype=float, na_value=np.nan)
+        # Per-column extremes instead of row-level boolean masks. fmin/fmax skip
+        # NaN, and an all-missing column (NaN) compares False, so missing values pass.
+        if np.fmin.reduce(vals) < lo or np.fmax.reduce(vals) > hi:
+            raise RangeError(message)
+
+
 def validate_ranges(sessions: pd.DataFrame, wellness: pd.DataFrame) -> None:
-    """Basic sanity checks. Adjust as needed."""
-    s = sessions
-    w = wellness
-
-    if (s["minutes"] < 0).any():
-        raise RangeError("sessions.minutes contains negative values.")
-    if ((s["sRPE"] < 0) | (s["sRPE"] > 10)).any():
-        raise RangeError("sessions.sRPE should be in [0, 10].")
-    if (s["external_load"] < 0).any():
-        raise RangeError("sessions.external_load contains negative values.")
-    for c in ["total_accels", "jump_count"]:
-        if (s[c] < 0).any():
-            raise RangeError(f"sessions.{c} contains negative values.")
-
-    if ((w["sleep_quality"] < 1) | (w["sleep_quality"] > 5)).any():
-        # Allow missing; check only non-missing
-        non_missing = w["sleep_quality"].dropna()
-        if ((non_missing < 1) | (non_missing > 5)).any():
-            raise RangeError("wellness.sleep_quality should be in [1, 5].")
-    for c in ["soreness", "fatigue", "stress", "mood"]:
-        non_missing = w[c].dropna()
-        if ((non_missing < 1) | (non_missing > 10)).any():
-            raise RangeError(f"wellness.{c} should be in [1, 10].")
-    non_missing_sleep = w["sleep_hours"].dropna()
-    if ((non_missing_sleep < 0) | (non_missing_sleep > 24)).any():
-        raise RangeError("wellness.sleep_hours should be in [0, 24].")
+    """Basic sanity checks. Adjust SESSIONS_RANGES / WELLNESS_RANGES as needed."""
+    _check_ranges(sessions, SESSIONS_RANGES)
+    _check_ranges(wellness, WELLNESS_RANGES)
 
 
 def prep_sessions(sessions: pd.DataFrame) -> pd.DataFrame:
@@ -67,12 +86,16 @@ def prep_sessions(sessions: pd.DataFrame) -> pd.DataFrame:
     out = _to_datetime(sessions, "date")
 
     num_cols = ["minutes", "sRPE", "external_load", "total_accels", "jump_count"]
+    numeric = {c: pd.to_numeric(out[c], errors="coerce") for c in num_cols}
     for c in num_cols:
-        out[c] = pd.to_numeric(out[c], errors="coerce")
+        out[c] = _to_compact_numeric(numeric[c])
 
-    out["internal_load"] = out["minutes"] * out["sRPE"]
+    # Multiply the full-precision inputs (before their float32 downcast), so the
+    # stored float32 load is the correctly rounded product (79.3 * 6.3 -> 499.59)
+    load = numeric["minutes"].to_numpy(dtype=float, na_value=np.nan) * numeric["sRPE"].to_numpy(dtype=float, na_value=np.nan)
+    out["internal_load"] = load.astype(np.float32)
 
-    out = out.sort_values(["player_id", "date"]).reset_index(drop=True)
+    out = sort_by_player_date(out)
     return out
 
 
@@ -87,14 +110,22 @@ def prep_wellness(wellness: pd.DataFrame, fill_method: str = "ffill") -> pd.Data
 
     num_cols = ["sleep_hours", "sleep_quality", "soreness", "fatigue", "stress", "mood"]
     for c in num_cols:
-        out[c] = pd.to_numeric(out[c], errors="coerce")
+        out[c] = _to_compact_numeric(out[c])
 
-    out = out.sort_values(["player_id", "date"]).reset_index(drop=True)
+    out = sort_by_player_date(out)
     
-    if fill_method == "ffill":
-        out[num_cols] = out.groupby("player_id")[num_cols].ffill()
-    elif fill_method == "bfill":
-        out[num_cols] = out.groupby("player_id")[num_cols].bfill()
+    if fill_method in ("ffill", "bfill"):
+        # Rows are sorted by player, so fill within each player's contiguous block
+        codes = key_codes(out["player_id"])
+        no_player = codes < 0
+        for c in num_cols:
+            pos = fill_positions(codes, out[c].notna().to_numpy(), backward=(fill_method == "bfill"))
+            vals = out[c].to_numpy()[pos]
+            if no_player.any():
+                # Rows without a player id belong to no group: missing, as with groupby
+                vals = vals.astype(np.result_type(vals.dtype, np.float32))
+                vals[no_player] = np.nan
+            out[c] = vals
     elif fill_method == "none":
         pass
     else:
@@ -1,12 +1,24 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+
+from .powerbi_export import (
+    ensure_bool_flags,
+    ensure_datetime,
+    make_calendar_dim,
+    make_date_key,
+    widen_float32,
+    write_table,
+)
+from .visualization import build_player_groups
 
 
 def _ensure_dir(path: Path) -> None:
@@ -14,7 +26,25 @@ def _ensure_dir(path: Path) -> None:
 
 
 def _latest_date(daily: pd.DataFrame) -> pd.Timestamp:
-    return pd.to_datetime(daily["date"]).max()
+    return ensure_datetime(daily["date"]).max()
+
+
+def _player_rows(
+    daily: pd.DataFrame,
+    player_id: str,
+    player_groups: Optional[Dict[str, np.ndarray]] = None,
+) -> pd.DataFrame:
+    """
+    One player's rows, sorted by date, with a datetime 'date' column.
+    player_groups (from build_player_groups(daily)) replaces the full-table filter.
+    """
+    if player_groups is None:
+        d = daily[daily["player_id"] == player_id]
+    else:
+        d = daily.take(player_groups.get(player_id, np.array([], dtype=np.intp)))
+    if not pd.api.types.is_datetime64_any_dtype(d["date"]):
+        d = d.assign(date=pd.to_datetime(d["date"]))
+    return d.sort_values("date")
 
 
 def _window_slice(df: pd.DataFrame, end_date: pd.Timestamp, days: int = 14) -> pd.DataFrame:
@@ -29,16 +59,17 @@ def make_player_snapshot_plot(
     player_id: str,
     snapshot_date: pd.Timestamp | None = None,
     lookback_days: int = 28,
+    player_groups: Optional[Dict[str, np.ndarray]] = None,
 ) -> plt.Figure:
     """
     Produces a coach-friendly snapshot plot:
     - internal_load (daily)
     - internal_load_7d (rolling)
     - readiness_score (z-score)
+
+    player_groups: optional build_player_groups(daily), for calls in a player loop.
     """
-    d = daily[daily["player_id"] == player_id].copy()
-    d["date"] = pd.to_datetime(d["date"])
-    d = d.sort_values("date")
+    d = _player_rows(daily, player_id, player_groups)
 
     if snapshot_date is None:
         snapshot_date = _latest_date(d)
@@ -46,7 +77,10 @@ def make_player_snapshot_plot(
 
     d = _window_slice(d, snapshot_date, days=lookback_days)
 
-    fig, ax1 = plt.subplots(figsize=(11, 4.5))
+    # A standalone Figure (not registered with pyplot), so snapshots can be
+    # rendered from several threads at once; see export_player_snapshots.
+    fig = Figure(figsize=(11, 4.5))
+    ax1 = fig.subplots()
 
     # Left axis: loads
     ax1.plot(d["date"], d["internal_load"], label="internal_load")
@@ -83,16 +117,17 @@ def make_player_snapshot_summary(
     player_id: str,
     snapshot_date: pd.Timestamp | None = None,
     lookback_days: int = 7,
+    player_groups: Optional[Dict[str, np.ndarray]] = None,
 ) -> str:
     """
     Produces a short, practitioner-readable summary:
     - recent 7d load vs prior 7d
     - readiness today vs recent average
     - flags if present
+
+    player_groups: optional build_player_groups(daily), for calls in a player loop.
     """
-    d = daily[daily["player_id"] == player_id].copy()
-    d["date"] = pd.to_datetime(d["date"])
-    d = d.sort_values("date")
+    d = _player_rows(daily, player_id, player_groups)
 
     if snapshot_date is None:
         snapshot_date = _latest_date(d)
@@ -107,12 +142,17 @@ def make_player_snapshot_summary(
             return f"No data found for player_id={player_id}."
         snapshot_date = row["date"].iloc[0]
 
-    # 7d vs previous 7d (using internal_load)
-    last_7 = d[(d["date"] > snapshot_date - pd.Timedelta(days=7)) & (d["date"] <= snapshot_date)]
-    prev_7 = d[(d["date"] > snapshot_date - pd.Timedelta(days=14)) & (d["date"] <= snapshot_date - pd.Timedelta(days=7))]
+    # 7d vs previous 7d (using internal_load). d is date-sorted, so both windows
+    # are contiguous row ranges found by binary search on the dates.
+    dates = pd.DatetimeIndex(d["date"])
+    i_prev, i_last, i_end = dates.searchsorted(
+        [snapshot_date - pd.Timedelta(days=14), snapshot_date - pd.Timedelta(days=7), snapshot_date],
+        side="right",
+    )
+    load = d["internal_load"].to_numpy(dtype=float)
 
-    last7_load = float(last_7["internal_load"].sum()) if not last_7.empty else np.nan
-    prev7_load = float(prev_7["internal_load"].sum()) if not prev_7.empty else np.nan
+    last7_load = float(np.nansum(load[i_last:i_end])) if i_end > i_last else np.nan
+    prev7_load = float(np.nansum(load[i_prev:i_last])) if i_last > i_prev else np.nan
 
     pct_change = np.nan
     if np.isfinite(last7_load) and np.isfinite(prev7_load) and prev7_load > 0:
@@ -120,7 +160,12 @@ def make_player_snapshot_summary(
 
     # Readiness
     readiness_today = row["readiness_score"].iloc[0] if "readiness_score" in row.columns else np.nan
-    readiness_7d_avg = float(last_7["readiness_score"].mean()) if ("readiness_score" in d.columns and not last_7.empty) else np.nan
+    readiness_7d_avg = np.nan
+    if "readiness_score" in d.columns:
+        last7_ready = d["readiness_score"].to_numpy(dtype=float)[i_last:i_end]
+        last7_ready = last7_ready[~np.isnan(last7_ready)]
+        if len(last7_ready):
+            readiness_7d_avg = float(last7_ready.mean())
 
     # Flags
     load_spike = bool(row["flag_load_spike"].iloc[0]) if "flag_load_spike" in row.columns else False
@@ -167,34 +212,65 @@ def export_player_snapshot(
     out_dir: Path,
     snapshot_date: pd.Timestamp | None = None,
     lookback_days: int = 28,
+    player_groups: Optional[Dict[str, np.ndarray]] = None,
 ) -> Tuple[Path, Path]:
     """
     Writes:
     - PNG snapshot plot
     - TXT summary
     Returns (png_path, txt_path)
+
+    player_groups: optional build_player_groups(daily), for calls in a player loop.
     """
     _ensure_dir(out_dir)
     fig_dir = out_dir / "figures"
     _ensure_dir(fig_dir)
 
     if snapshot_date is None:
-        snapshot_date = _latest_date(daily[daily["player_id"] == player_id])
+        snapshot_date = _latest_date(_player_rows(daily, player_id, player_groups))
     snapshot_date = pd.to_datetime(snapshot_date)
 
-    fig = make_player_snapshot_plot(daily, player_id, snapshot_date=snapshot_date, lookback_days=lookback_days)
-    summary = make_player_snapshot_summary(daily, player_id, snapshot_date=snapshot_date)
+    fig = make_player_snapshot_plot(
+        daily, player_id, snapshot_date=snapshot_date, lookback_days=lookback_days, player_groups=player_groups
+    )
+    summary = make_player_snapshot_summary(daily, player_id, snapshot_date=snapshot_date, player_groups=player_groups)
 
     png_path = fig_dir / f"player_{player_id}_snapshot_{snapshot_date.date()}.png"
     txt_path = out_dir / f"player_{player_id}_summary_{snapshot_date.date()}.txt"
 
     fig.savefig(png_path, dpi=200, bbox_inches="tight")
-    plt.close(fig)
 
     txt_path.write_text(summary, encoding="utf-8")
 
     return png_path, txt_path
 
+
+def export_player_snapshots(
+    daily: pd.DataFrame,
+    player_ids: Iterable[str],
+    out_dir: Path,
+    snapshot_date: pd.Timestamp | None = None,
+    lookback_days: int = 28,
+    max_workers: Optional[int] = None,
+) -> List[Tuple[Path, Path]]:
+    """
+    Runs export_player_snapshot for several players on a thread pool.
+    Each player gets its own Figure, and PNG encoding happens outside the GIL.
+    Player rows are looked up from one build_player_groups pass instead of
+    filtering daily per player.
+    Returns [(png_path, txt_path), ...] in player_ids order.
+    """
+    _ensure_dir(out_dir / "figures")
+    groups = build_player_groups(daily)
+
+    def export_one(pid: str) -> Tuple[Path, Path]:
+        return export_player_snapshot(
+            daily, pid, out_dir, snapshot_date=snapshot_date, lookback_days=lookback_days, player_groups=groups
+        )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(export_one, player_ids))
+
 def make_team_daily_table(
     daily: pd.DataFrame,
     snapshot_date: pd.Timestamp,
@@ -204,9 +280,9 @@ def make_team_daily_table(
     Includes key columns commonly used by performance staff.
     """
     snapshot_date = pd.to_datetime(snapshot_date)
-    d0 = daily.copy()
-    d0["date"] = pd.to_datetime(d0["date"])
-    d0 = d0[d0["date"] == snapshot_date].copy()
+    dates = ensure_datetime(daily["date"])
+    mask = dates == snapshot_date
+    d0 = daily[mask].assign(date=dates[mask])
 
     cols = [
         "date",
@@ -249,25 +325,10 @@ def export_team_daily_report(
 
     team_table = make_team_daily_table(daily, snapshot_date)
     csv_path = out_dir / f"team_report_{snapshot_date.date()}.csv"
-    team_table.to_csv(csv_path, index=False)
+    widen_float32(team_table).to_csv(csv_path, index=False)
 
     return csv_path
 
-def make_calendar_dim(dates: pd.Series) -> pd.DataFrame:
-    """Create a calendar dimension table for PowerBI relationships."""
-    d = pd.to_datetime(pd.Series(dates).dropna().unique())
-    cal = pd.DataFrame({"date": pd.to_datetime(sorted(d))})
-    cal["date_key"] = cal["date"].dt.strftime("%Y%m%d").astype(int)
-    cal["year"] = cal["date"].dt.year
-    cal["month"] = cal["date"].dt.month
-    cal["month_name"] = cal["date"].dt.strftime("%b")
-    cal["week"] = cal["date"].dt.isocalendar().week.astype(int)
-    cal["day"] = cal["date"].dt.day
-    cal["day_name"] = cal["date"].dt.strftime("%a")
-    cal["is_weekend"] = cal["date"].dt.weekday >= 5
-    return cal
-
-
 def make_players_dim(players: pd.DataFrame) -> pd.DataFrame:
     """Players dimension table."""
     dim = players.copy()
@@ -281,9 +342,9 @@ def make_daily_fact(daily: pd.DataFrame) -> pd.DataFrame:
     Fact table: one row per player per date, PowerBI-friendly.
     Adds integer date_key for relationships.
     """
-    df = daily.copy()
-    df["date"] = pd.to_datetime(df["date"])
-    df["date_key"] = df["date"].dt.strftime("%Y%m%d").astype(int)
+    df = daily.copy(deep=False)
+    df["date"] = ensure_datetime(df["date"])
+    df["date_key"] = make_date_key(df["date"])
 
     # Ensure IDs are strings
     df["player_id"] = df["player_id"].astype(str)
@@ -302,9 +363,8 @@ def make_daily_fact(daily: pd.DataFrame) -> pd.DataFrame:
     df = df[keep].sort_values(["player_id", "date"]).reset_index(drop=True)
 
     # Make booleans explicit (PowerBI handles True/False well)
-    for c in ["flag_load_spike", "flag_low_readiness"]:
-        if c in df.columns:
-            df[c] = df[c].fillna(False).astype(bool)
+    flag_cols = [c for c in ("flag_load_spike", "flag_low_readiness") if c in df.columns]
+    ensure_bool_flags(df, flag_cols)
 
     return df
 
@@ -313,9 +373,10 @@ def export_powerbi_tables(
     players: pd.DataFrame,
     daily: pd.DataFrame,
     out_dir: Path,
+    file_format: str = "csv",
 ) -> dict:
     """
-    Writes:
+    Writes (CSV by default, or Parquet with file_format='parquet'):
       outputs/powerbi/dim_players.csv
       outputs/powerbi/dim_calendar.csv
       outputs/powerbi/fact_daily.csv
@@ -329,12 +390,8 @@ def export_powerbi_tables(
     dim_calendar = make_calendar_dim(daily["date"])
     fact_daily = make_daily_fact(daily)
 
-    p1 = pb_dir / "dim_players.csv"
-    p2 = pb_dir / "dim_calendar.csv"
-    p3 = pb_dir / "fact_daily.csv"
-
-    dim_players.to_csv(p1, index=False)
-    dim_calendar.to_csv(p2, index=False)
-    fact_daily.to_csv(p3, index=False)
+    p1 = write_table(dim_players, pb_dir / "dim_players", file_format)
+    p2 = write_table(dim_calendar, pb_dir / "dim_calendar", file_format)
+    p3 = write_table(fact_daily, pb_dir / "fact_daily", file_format)
 
     return {"dim_players": p1, "dim_calendar": p2, "fact_daily": p3}
\ No newline at end of file
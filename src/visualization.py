@@ -9,10 +9,191 @@ Note: Keep plots coach-friendly:
 
 from __future__ import annotations
 
-from typing import Iterable, List, Optional, Sequence
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+# matplotlib is imported inside the functions that draw, so importing the data
+# helpers (prepare_daily, shrink_daily, ...) does not load pyplot, fonts or a backend
+
+
+# Structures derived from a daily frame (indexes, groupings, rendered plots), keyed
+# by id(daily) and dropped when the frame is garbage collected. Frames passed to
+# the plotters are treated as read-only: after modifying daily in place, bump
+# daily.attrs["version"] (or pass a new frame) so everything is rebuilt.
+_DERIVED: Dict[int, Tuple[weakref.ref, object, Dict[Hashable, object]]] = {}
+
+
+def _forget(ref: weakref.ref, key: int) -> None:
+    entry = _DERIVED.get(key)
+    if entry is not None and entry[0] is ref:
+        del _DERIVED[key]
+
+
+def _derived(daily: pd.DataFrame, name: Hashable, build: Callable[[], object]):
+    """Return build() for this frame (and attrs version), computing it only on first use."""
+    key = id(daily)
+    version = daily.attrs.get("version", 0)
+    entry = _DERIVED.get(key)
+    if entry is None or entry[0]() is not daily:
+        ref = weakref.ref(daily, lambda r, k=key: _forget(r, k))
+        entry = _DERIVED[key] = (ref, version, {})
+    elif entry[1] != version:
+        entry = _DERIVED[key] = (entry[0], version, {})
+    cache = entry[2]
+    if name not in cache:
+        cache[name] = build()
+    return cache[name]
+
+
+def shrink_daily(daily: pd.DataFrame) -> pd.DataFrame:
+    """
+    daily with float64 columns as float32 and int64 columns (counts) as int32.
+
+    Plots need no more precision than this, and the smaller columns halve the
+    bytes moved when slicing and sorting plot data. Integer columns with values
+    outside the int32 range are left as they are. Returns a new frame.
+    """
+    i32 = np.iinfo(np.int32)
+    dtypes = {}
+    for c in daily.columns:
+        s = daily[c]
+        if s.dtype == np.float64:
+            dtypes[c] = np.float32
+        elif s.dtype == np.int64 and (s.empty or (i32.min <= s.min() and s.max() <= i32.max)):
+            dtypes[c] = np.int32
+    return daily.astype(dtypes)
+
+
+def _is_prepared(daily: pd.DataFrame) -> bool:
+    return list(daily.index.names) == ["player_id", "date"] and daily.index.is_monotonic_increasing
+
+
+def prepare_daily(daily: pd.DataFrame) -> pd.DataFrame:
+    """
+    daily indexed by a sorted (player_id, date) MultiIndex, as used by the plotters.
+
+    Preparing once lets a dashboard loop slice players and dates without rescanning
+    the table. player_id is made categorical if it is not already. The plotters
+    also accept the plain daily table and prepare it on first use, so calling
+    this is optional.
+    """
+    if _is_prepared(daily):
+        return daily
+    # Categorical ids: the player level is then matched on integer codes
+    if not isinstance(daily["player_id"].dtype, pd.CategoricalDtype):
+        daily = daily.astype({"player_id": "category"})
+    return daily.set_index(["player_id", "date"]).sort_index()
+
+
+def build_player_groups(daily: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    {player_id: row positions} for daily (plain or prepared), from one groupby pass.
+
+    For loops over players outside the plotters: daily.take(groups[pid]) gives a
+    player's rows without filtering the whole table each time.
+    """
+    return daily.groupby("player_id", sort=False, observed=True).indices
+
+
+def _prepared(daily: pd.DataFrame) -> pd.DataFrame:
+    """prepare_daily(daily), built once per frame."""
+    if _is_prepared(daily):
+        return daily
+    return _derived(daily, "prepared", lambda: prepare_daily(daily))
+
+
+def _by_date(daily: pd.DataFrame) -> pd.DataFrame:
+    """Prepared rows re-indexed by a sorted DatetimeIndex (players in order within a date)."""
+    prepared = _prepared(daily)
+    return _derived(
+        prepared, "by_date",
+        lambda: prepared.reset_index(level="player_id").sort_index(kind="stable"),
+    )
+
+
+def _top_k(vals: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the k largest vals, largest first with ties in row order.
+    Missing values rank last, as in DataFrame.nlargest.
+    """
+    missing = np.isnan(vals)
+    pos = np.flatnonzero(~missing)
+    v = vals[pos]
+    if k <= 0:
+        return pos[:0]
+    if k < len(v):
+        # Partial selection of the k-th largest value, then the first tied rows to fill k
+        thr = np.partition(v, len(v) - k)[len(v) - k]
+        above = v > thr
+        tied = v == thr
+        keep = above | (tied & (np.cumsum(tied) <= k - np.count_nonzero(above)))
+        pos, v = pos[keep], v[keep]
+    top = pos[np.lexsort((pos, -v))]
+    return np.concatenate([top, np.flatnonzero(missing)[: k - len(top)]])
+
+
+def _values(frame: pd.DataFrame, col: str) -> np.ndarray:
+    """
+    frame[col] as a float array (missing as NaN), built once per frame. Float
+    columns keep their own width, so shrink_daily output stays float32.
+    """
+    def build():
+        s = frame[col]
+        dtype = s.dtype if s.dtype.kind == "f" else float
+        return s.to_numpy(dtype=dtype, na_value=np.nan)
+
+    return _derived(frame, ("values", col), build)
+
+
+def _date_nums(prepared: pd.DataFrame) -> np.ndarray:
+    """Matplotlib date numbers for every row of a prepared frame, built once."""
+    import matplotlib.dates as mdates
+
+    return _derived(
+        prepared, "date_nums",
+        lambda: mdates.date2num(prepared.index.get_level_values("date").to_numpy()),
+    )
+
+
+def _player_series(
+    daily: pd.DataFrame, player_id: str, cols: Sequence[str]
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """Date numbers and {col: values} (present cols only) for one player's trend, cached."""
+    def build():
+        # One player's rows are a contiguous, date-ordered block of the prepared frame
+        prepared = _prepared(daily)
+        try:
+            rows = prepared.index.get_loc(player_id)
+        except KeyError:
+            rows = slice(0, 0)
+        present = [c for c in cols if c in prepared.columns]
+        return _date_nums(prepared)[rows], {c: _values(prepared, c)[rows] for c in present}
+
+    return _derived(daily, ("player_series", player_id, tuple(cols)), build)
+
+
+def _team_bars(
+    daily: pd.DataFrame, snapshot_date: pd.Timestamp, metric: str, top_n: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Player labels and metric values of the top N players on snapshot_date, cached."""
+    def build():
+        # Binary search for the day's block on the sorted date index, then top N on
+        # plain arrays (cached per frame and metric) without building a DataFrame
+        by_date = _by_date(daily)
+        vals = _values(by_date, metric)
+        labels = _derived(by_date, "player_labels", lambda: by_date["player_id"].to_numpy())
+        lo = by_date.index.searchsorted(snapshot_date, side="left")
+        hi = by_date.index.searchsorted(snapshot_date, side="right")
+        top = lo + _top_k(vals[lo:hi], top_n)
+        return labels[top], vals[top]
+
+    return _derived(daily, ("team_bars", snapshot_date, metric, top_n), build)
 
 
 def plot_player_timeseries(
@@ -20,34 +201,207 @@ def plot_player_timeseries(
     player_id: str,
     cols: Sequence[str] = ("internal_load", "internal_load_7d", "readiness_score"),
     title: Optional[str] = None,
+    ax=None,
+    legend_loc: str = "upper left",
 ):
-    """Line plot of selected metrics for a single player across time."""
-    d = daily[daily["player_id"] == player_id].copy()
-    d = d.sort_values("date")
-    fig, ax = plt.subplots(figsize=(10, 4))
-    for c in cols:
-        if c in d.columns:
-            ax.plot(d["date"], d[c], label=c)
+    """
+    Line plot of selected metrics for a single player across time.
+
+    daily may be the plain daily table or the output of prepare_daily.
+
+    Pass ax to draw into an existing Axes (e.g. one reused across a batch export,
+    cleared with ax.clear() between players); otherwise a new figure is created.
+    legend_loc is a fixed legend position; "best" also works but searches for a
+    free spot on every draw.
+
+    Indexes and arrays derived from daily are cached with the frame. After changing
+    daily in place, bump daily.attrs["version"] (or pass a new frame); otherwise the
+    plot shows the data as it was on the first call.
+    """
+    import matplotlib.dates as mdates
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import LineCollection
+    from matplotlib.lines import Line2D
+
+    x, series = _player_series(daily, player_id, cols)
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(10, 4))
+    else:
+        fig = ax.figure
+
+    # All metrics as one LineCollection (a single artist) instead of one Line2D each
+    present = list(series)
+    segments = [np.column_stack([x, series[c]]) for c in present]
+    colors = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    colors = [colors[i % len(colors)] for i in range(len(present))]
+    ax.add_collection(LineCollection(segments, colors=colors))
+    # Concise date ticks need no rotation, so no autofmt_xdate layout pass
+    locator = mdates.AutoDateLocator()
+    ax.xaxis.set_major_locator(locator)
+    ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+    ax.autoscale_view()
+    handles = [Line2D([], [], color=col, label=c) for c, col in zip(present, colors)]
+
     ax.set_xlabel("Date")
     ax.set_ylabel("Value")
     ax.set_title(title or f"Player {player_id} trend")
-    ax.legend(loc="best")
-    fig.autofmt_xdate()
+    ax.legend(handles=handles, loc=legend_loc)
     return fig
 
 
+# Rendered PNGs kept per frame by player_timeseries_png (least recently used dropped)
+_PNG_CACHE_SIZE = 256
+
+
+def player_timeseries_png(
+    daily: pd.DataFrame,
+    player_id: str,
+    cols: Sequence[str] = ("internal_load", "internal_load_7d", "readiness_score"),
+    title: Optional[str] = None,
+    dpi: int = 100,
+) -> bytes:
+    """
+    plot_player_timeseries rendered to PNG bytes, cached per frame.
+
+    Repeated views of the same player (dashboard tab switches, refreshes) return
+    the stored image without redrawing, until daily.attrs["version"] changes.
+    Each frame keeps its _PNG_CACHE_SIZE most recently used images.
+    """
+    import matplotlib.pyplot as plt
+
+    cache = _derived(daily, "png_cache", OrderedDict)
+    key = (player_id, tuple(cols), title, dpi)
+    if key in cache:
+        cache.move_to_end(key)
+        return cache[key]
+
+    fig = plot_player_timeseries(daily, player_id, cols=cols, title=title)
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi)
+    plt.close(fig)
+    png = cache[key] = buf.getvalue()
+    if len(cache) > _PNG_CACHE_SIZE:
+        cache.popitem(last=False)
+    return png
+
+
+def render_player_png(
+    daily: pd.DataFrame,
+    player_id: str,
+    path: Path,
+    cols: Sequence[str] = ("internal_load", "internal_load_7d", "readiness_score"),
+    title: Optional[str] = None,
+    dpi: int = 100,
+) -> Path:
+    """
+    Writes plot_player_timeseries for one player to path as PNG and closes the
+    figure, so batch exports do not accumulate open figures. Returns path.
+
+    Uses fast, light PNG compression (zlib level 1); the files are somewhat
+    larger than savefig's default.
+    """
+    import matplotlib.pyplot as plt
+
+    fig = plot_player_timeseries(daily, player_id, cols=cols, title=title)
+    try:
+        fig.savefig(path, format="png", dpi=dpi, pil_kwargs={"compress_level": 1})
+    finally:
+        plt.close(fig)
+    return path
+
+
+# Prepared frame held by each plot_all_players worker process
+_WORKER_DAILY: Optional[pd.DataFrame] = None
+
+
+def _init_worker(prepared: pd.DataFrame) -> None:
+    global _WORKER_DAILY
+    import matplotlib
+    matplotlib.use("Agg")  # workers only write files
+    _WORKER_DAILY = prepared
+
+
+def _render_player(player_id: str, path: Path, cols: Sequence[str], dpi: int) -> Path:
+    return render_player_png(_WORKER_DAILY, player_id, path, cols=cols, dpi=dpi)
+
+
+def plot_all_players(
+    daily: pd.DataFrame,
+    player_ids: Iterable[str],
+    out_dir: Path,
+    cols: Sequence[str] = ("internal_load", "internal_load_7d", "readiness_score"),
+    dpi: int = 100,
+    max_workers: Optional[int] = None,
+) -> List[Path]:
+    """
+    Writes out_dir/player_<id>_trend.png for each player, rendering in parallel
+    worker processes (max_workers defaults to the CPU count).
+
+    The prepared frame is sent to each worker once, not per player.
+    Returns the PNG paths in player_ids order.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    player_ids = list(player_ids)
+    paths = [out_dir / f"player_{pid}_trend.png" for pid in player_ids]
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(prepare_daily(daily),)
+    ) as pool:
+        futures = [pool.submit(_render_player, pid, path, tuple(cols), dpi) for pid, path in zip(player_ids, paths)]
+        return [f.result() for f in futures]
+
+
 def plot_team_overview(
     daily: pd.DataFrame,
     snapshot_date: pd.Timestamp,
     metric: str = "internal_load_7d",
     top_n: int = 10,
+    ax=None,
 ):
-    """Bar chart of a team snapshot on a given date (top N by metric)."""
-    d = daily[daily["date"] == snapshot_date].copy()
-    d = d.sort_values(metric, ascending=False).head(top_n)
-    fig, ax = plt.subplots(figsize=(10, 4))
-    ax.bar(d["player_id"], d[metric])
+    """
+    Bar chart of a team snapshot on a given date (top N by metric).
+
+    Pass ax to draw into an existing Axes (e.g. one reused across a batch export,
+    cleared with ax.clear() between dates); otherwise a new figure is created.
+
+    As with plot_player_timeseries, data derived from daily is cached with the
+    frame: bump daily.attrs["version"] after changing daily in place.
+    """
+    import matplotlib.pyplot as plt
+
+    labels, values = _team_bars(daily, snapshot_date, metric, top_n)
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(10, 4))
+    else:
+        fig = ax.figure
+    # Integer positions with explicit tick labels, skipping matplotlib's string-category units
+    pos = np.arange(len(labels))
+    ax.bar(pos, values)
+    ax.set_xticks(pos, labels=labels)
     ax.set_xlabel("Player")
     ax.set_ylabel(metric)
     ax.set_title(f"Team overview on {snapshot_date.date()} ({metric})")
     return fig
+
+
+def build_dashboard_inputs(
+    daily: pd.DataFrame,
+    snapshot_date: pd.Timestamp,
+    player_ids: Iterable[str],
+    metric: str = "internal_load_7d",
+    top_n: int = 10,
+    cols: Sequence[str] = ("internal_load", "internal_load_7d", "readiness_score"),
+) -> dict:
+    """
+    Plot inputs for a dashboard of one team overview and several player trends:
+      {"team": (player_labels, values), "players": {player_id: (date_nums, {col: values})}}
+
+    All of them come from the same prepared frame, each as a binary-searched slice,
+    and are cached, so the following plot_team_overview / plot_player_timeseries
+    calls with the same arguments reuse them instead of slicing daily again.
+    """
+    return {
+        "team": _team_bars(daily, snapshot_date, metric, top_n),
+        "players": {pid: _player_series(daily, pid, cols) for pid in player_ids},
+    }